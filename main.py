@@ -1,17 +1,28 @@
 import os
+import asyncio
 import logging
 from pathlib import Path
 
-from aiogram import Bot, Dispatcher, types
-from aiogram.filters import Command
+from aiogram import Bot, Dispatcher, F, types
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.filters import Command, CommandObject
+from aiogram.filters.callback_data import CallbackData
 from aiogram.fsm.storage.memory import MemoryStorage
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 
-from sqlalchemy import create_engine, Column, Integer, String, Boolean
-from sqlalchemy.orm import declarative_base, sessionmaker
+import aiosqlite
+import orjson
+from cachetools import LRUCache, TTLCache
+from aiosqlitepool import SQLiteConnectionPool
+
+from sqlalchemy import Column, Index, Integer, String, Boolean, event, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from twilio.rest import Client as TwilioClient
-import smtplib
+import aiosmtplib
 from email.mime.text import MIMEText
 from dotenv import load_dotenv
 
@@ -25,20 +36,76 @@ DATABASE_URL = os.getenv('DATABASE_URL')
 logging.basicConfig(level=logging.INFO)
 
 # Bot and dispatcher
-bot = Bot(token=API_TOKEN)
+class StaticMarkupSession(AiohttpSession):
+    # Markups registered here are serialized on first send and reused as raw JSON
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._static_markups: dict[int, str | None] = {}
+
+    def register_static_markup(self, markup: types.InlineKeyboardMarkup) -> types.InlineKeyboardMarkup:
+        self._static_markups[id(markup)] = None
+        return markup
+
+    def build_form_data(self, bot, method):
+        markup = getattr(method, 'reply_markup', None)
+        if markup is None or id(markup) not in self._static_markups:
+            return super().build_form_data(bot, method)
+        payload = self._static_markups[id(markup)]
+        if payload is None:
+            payload = self._static_markups[id(markup)] = self.prepare_value(markup, bot=bot, files={})
+        form = super().build_form_data(bot, method.model_copy(update={'reply_markup': None}))
+        form.add_field('reply_markup', payload)
+        return form
+
+# orjson encodes outgoing payloads (keyboards included) and parses API responses
+session = StaticMarkupSession(
+    json_loads=orjson.loads,
+    json_dumps=lambda obj: orjson.dumps(obj).decode(),
+)
+bot = Bot(token=API_TOKEN, session=session)
 storage = MemoryStorage()
 dp = Dispatcher(storage=storage)
 
 # Database setup
 BASE_DIR = Path(__file__).resolve().parent
 if DATABASE_URL:
-    engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+    db_url = make_url(DATABASE_URL).set(drivername='sqlite+aiosqlite')
+    db_path = db_url.database
 else:
     db_path = BASE_DIR / 'bot.db'
-    engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False})
+    db_url = f"sqlite+aiosqlite:///{db_path}"
+engine = create_async_engine(
+    db_url,
+    poolclass=AsyncAdaptedQueuePool,
+    pool_size=5,
+    max_overflow=10,
+    pool_pre_ping=True,
+    pool_recycle=1800,
+)
+
+# ~20MB page cache per connection. The journal mode stays at its default:
+# docker-compose mounts only bot.db, so a WAL side file would not persist.
+SQLITE_PRAGMAS = (
+    'PRAGMA cache_size=-20000',
+)
+
+@event.listens_for(engine.sync_engine, 'connect')
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+
+async def connect_sqlite():
+    conn = await aiosqlite.connect(str(db_path))
+    for pragma in SQLITE_PRAGMAS:
+        await conn.execute(pragma)
+    return conn
 
 Base = declarative_base()
-SessionLocal = sessionmaker(bind=engine)
+AsyncSessionLocal = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+# Long-lived raw connections for hot reads, keeps SQLite page cache warm
+pool = SQLiteConnectionPool(connect_sqlite)
 
 class Vacancy(Base):
     __tablename__ = 'vacancies'
@@ -46,6 +113,8 @@ class Vacancy(Base):
     title = Column(String, nullable=False)
     description = Column(String, nullable=False)
     city = Column(String, nullable=False)
+    # Covers the (id, title) projection used by the paginated list
+    __table_args__ = (Index('ix_vac_id_title', 'id', 'title'),)
 
 class Toggle(Base):
     __tablename__ = 'toggles'
@@ -56,16 +125,69 @@ class Blacklist(Base):
     __tablename__ = 'blacklist'
     user_id = Column(Integer, primary_key=True)
 
-Base.metadata.create_all(engine)
+# In-memory copies of the small, rarely changed tables
+TOGGLES: dict[str, bool] = {}
+BLACKLIST: set[int] = set()
+
+async def on_startup():
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        # create_all skips indexes of tables that already exist
+        for index in Vacancy.__table__.indexes:
+            await conn.run_sync(index.create, checkfirst=True)
+        TOGGLES.update((await conn.execute(select(Toggle.name, Toggle.enabled))).all())
+        BLACKLIST.update((await conn.scalars(select(Blacklist.user_id))).all())
+
+async def on_shutdown():
+    await pool.close()
+    await engine.dispose()
+
+# Hot-path reads
+async def fetch_vacancy_page(after_id: int, per_page: int):
+    # Keyset pagination: one extra row tells whether a next page exists
+    async with pool.connection() as conn:
+        cursor = await conn.execute(
+            'SELECT id, title FROM vacancies WHERE id > ? ORDER BY id LIMIT ?',
+            (after_id, per_page + 1),
+        )
+        rows = await cursor.fetchall()
+        prev_id = None
+        if after_id:
+            # The previous page ends at after_id; its cursor is the id just before it
+            cursor = await conn.execute(
+                'SELECT id FROM vacancies WHERE id <= ? ORDER BY id DESC LIMIT ?',
+                (after_id, per_page + 1),
+            )
+            before = await cursor.fetchall()
+            if before:
+                prev_id = before[per_page][0] if len(before) > per_page else 0
+    return rows[:per_page], len(rows) > per_page, prev_id
+
+# Vacancies shown in a list are likely to be opened next
+_vac_detail_cache = LRUCache(maxsize=256)
+
+async def prefetch_vacancy_details(ids: list[int]):
+    if not ids:
+        return
+    placeholders = ', '.join('?' * len(ids))
+    async with pool.connection() as conn:
+        cursor = await conn.execute(
+            f'SELECT id, title, description, city FROM vacancies WHERE id IN ({placeholders})',
+            ids,
+        )
+        rows = await cursor.fetchall()
+    for vid, title, description, city in rows:
+        _vac_detail_cache[vid] = Vacancy(id=vid, title=title, description=description, city=city)
 
 # SMS and Email with error handling
 TWILIO_SID = os.getenv('TWILIO_SID')
 TWILIO_TOKEN = os.getenv('TWILIO_TOKEN')
+# Shared client keeps its HTTP session (and TLS connection) alive between SMS
+_twilio = TwilioClient(TWILIO_SID, TWILIO_TOKEN) if TWILIO_SID and TWILIO_TOKEN else None
 def send_sms(to_number: str, body: str):
-    if TWILIO_SID and TWILIO_TOKEN:
+    if _twilio:
         try:
-            client = TwilioClient(TWILIO_SID, TWILIO_TOKEN)
-            client.messages.create(body=body, to=to_number, from_=os.getenv('TWILIO_FROM'))
+            _twilio.messages.create(body=body, to=to_number, from_=os.getenv('TWILIO_FROM'))
         except Exception as e:
             logging.error(f"Error sending SMS notification: {e}")
 
@@ -73,21 +195,94 @@ SMTP_HOST = os.getenv('SMTP_HOST')
 SMTP_PORT = int(os.getenv('SMTP_PORT', 587))
 SMTP_USER = os.getenv('SMTP_USER')
 SMTP_PASS = os.getenv('SMTP_PASS')
-def send_email(to_email: str, subject: str, body: str):
-    if not (SMTP_HOST and SMTP_USER and SMTP_PASS):
-        logging.warning("SMTP not fully configured, skipping email notification")
-        return
+async def smtp_connect() -> aiosmtplib.SMTP:
+    server = aiosmtplib.SMTP(hostname=SMTP_HOST, port=SMTP_PORT, timeout=10, start_tls=True)
+    await server.connect()
+    await server.login(SMTP_USER, SMTP_PASS)
+    return server
+
+def build_email(to_email: str, subject: str, body: str) -> MIMEText:
+    msg = MIMEText(body)
+    msg['Subject'] = subject
+    msg['From'] = SMTP_USER
+    msg['To'] = to_email
+    return msg
+
+# Notifications are queued by handlers and sent by background workers
+email_queue: asyncio.Queue = asyncio.Queue()
+sms_queue: asyncio.Queue = asyncio.Queue()
+_workers: list[asyncio.Task] = []
+
+async def email_worker():
+    # One authenticated SMTP session is reused for all messages
+    server = None
+    try:
+        while True:
+            msg = await email_queue.get()
+            try:
+                if not (SMTP_HOST and SMTP_USER and SMTP_PASS):
+                    logging.warning("SMTP not fully configured, skipping email notification")
+                    continue
+                try:
+                    if server is None:
+                        server = await smtp_connect()
+                    await server.send_message(msg)
+                except aiosmtplib.SMTPServerDisconnected:
+                    # Server dropped the idle session, reconnect and retry once
+                    server = await smtp_connect()
+                    await server.send_message(msg)
+            except Exception as e:
+                logging.error(f"Error sending email to {msg['To']}: {e}")
+                if server is not None:
+                    server.close()
+                server = None
+            finally:
+                email_queue.task_done()
+    finally:
+        if server is not None:
+            server.close()
+
+async def sms_worker():
+    while True:
+        to_number, body = await sms_queue.get()
+        try:
+            await asyncio.to_thread(send_sms, to_number, body)
+        finally:
+            sms_queue.task_done()
+
+async def start_workers():
+    _workers.append(asyncio.create_task(email_worker()))
+    _workers.append(asyncio.create_task(sms_worker()))
+
+WORKER_DRAIN_TIMEOUT = 30
+
+async def stop_workers():
+    # Let queued notifications go out before the workers are cancelled
     try:
-        msg = MIMEText(body)
-        msg['Subject'] = subject
-        msg['From'] = SMTP_USER
-        msg['To'] = to_email
-        with smtplib.SMTP(SMTP_HOST, SMTP_PORT, timeout=10) as server:
-            server.starttls()
-            server.login(SMTP_USER, SMTP_PASS)
-            server.send_message(msg)
-    except Exception as e:
-        logging.error(f"Error sending email to {to_email}: {e}")
+        await asyncio.wait_for(
+            asyncio.gather(email_queue.join(), sms_queue.join()),
+            timeout=WORKER_DRAIN_TIMEOUT,
+        )
+    except asyncio.TimeoutError:
+        logging.error(
+            f"Dropping {email_queue.qsize()} email and {sms_queue.qsize()} SMS "
+            f"notifications left in the queues on shutdown"
+        )
+    for task in _workers:
+        task.cancel()
+    await asyncio.gather(*_workers, return_exceptions=True)
+    _workers.clear()
+
+# Callback data
+class VacCB(CallbackData, prefix='vac'):
+    id: int
+
+class VacPageCB(CallbackData, prefix='vac_page'):
+    after_id: int
+
+class RespCB(CallbackData, prefix='respond'):
+    mode: str
+    key: str
 
 # Keyboards
 def build_main_menu() -> types.InlineKeyboardMarkup:
@@ -102,88 +297,114 @@ def build_main_menu() -> types.InlineKeyboardMarkup:
     )
     return builder.as_markup()
 
-async def build_event_menu(key: str, description: str):
+def build_event_markup(key: str) -> types.InlineKeyboardMarkup:
     builder = InlineKeyboardBuilder()
     builder.row(
-        types.InlineKeyboardButton(text='Откликнуться', callback_data=f'respond_evt_{key}'),
+        types.InlineKeyboardButton(text='Откликнуться', callback_data=RespCB(mode='evt', key=key).pack()),
         types.InlineKeyboardButton(text='Главное меню', callback_data='main'),
     )
-    return description, builder.as_markup()
+    return builder.as_markup()
+
+def build_main_only_markup() -> types.InlineKeyboardMarkup:
+    builder = InlineKeyboardBuilder()
+    builder.row(types.InlineKeyboardButton(text='Главное меню', callback_data='main'))
+    return builder.as_markup()
 
-async def build_vacancy_list(page: int):
+# Static markups are built once and shared between updates
+_MAIN_MENU = session.register_static_markup(build_main_menu())
+_EVENT_MARKUPS = {
+    key: session.register_static_markup(build_event_markup(key)) for key in ('career', 'practice')
+}
+_MAIN_ONLY_MARKUP = session.register_static_markup(build_main_only_markup())
+
+async def build_event_menu(key: str, description: str):
+    return description, _EVENT_MARKUPS[key]
+
+# Rendered vacancy list pages, cleared whenever a vacancy is added
+_vac_cache = TTLCache(maxsize=64, ttl=60)
+
+async def build_vacancy_list(after_id: int):
+    hit = _vac_cache.get(after_id)
+    if hit:
+        return hit
     per_page = 5
-    with SessionLocal() as db:
-        total = db.query(Vacancy).count()
-        vacs = db.query(Vacancy).offset(page * per_page).limit(per_page).all()
+    vacs, has_next, prev_id = await fetch_vacancy_page(after_id, per_page)
+    await prefetch_vacancy_details([vid for vid, _ in vacs])
 
     builder = InlineKeyboardBuilder()
-    for v in vacs:
-        builder.button(text=v.title, callback_data=f'vac_{v.id}')
+    for vid, title in vacs:
+        builder.button(text=title, callback_data=VacCB(id=vid))
     builder.adjust(1)
 
     nav_buttons = []
-    if page > 0:
-        nav_buttons.append(types.InlineKeyboardButton(text='Назад', callback_data=f'vac_page_{page-1}'))
-    if (page + 1) * per_page < total:
-        nav_buttons.append(types.InlineKeyboardButton(text='Далее', callback_data=f'vac_page_{page+1}'))
+    if prev_id is not None:
+        nav_buttons.append(types.InlineKeyboardButton(text='Назад', callback_data=VacPageCB(after_id=prev_id).pack()))
+    if has_next:
+        nav_buttons.append(types.InlineKeyboardButton(text='Далее', callback_data=VacPageCB(after_id=vacs[-1][0]).pack()))
     if nav_buttons:
         builder.row(*nav_buttons)
     builder.row(types.InlineKeyboardButton(text='Главное меню', callback_data='main'))
 
-    return 'Список вакансий:', builder.as_markup()
+    result = 'Список вакансий:', builder.as_markup()
+    _vac_cache[after_id] = result
+    return result
 
 async def build_vacancy_detail(vac: Vacancy):
     text = f"{vac.title}\n{vac.description}\nГород: {vac.city}"
     builder = InlineKeyboardBuilder()
     builder.row(
-        types.InlineKeyboardButton(text='Откликнуться', callback_data=f'respond_vac_{vac.id}'),
+        types.InlineKeyboardButton(text='Откликнуться', callback_data=RespCB(mode='vac', key=str(vac.id)).pack()),
         types.InlineKeyboardButton(text='Главное меню', callback_data='main'),
     )
     return text, builder.as_markup()
 
 # Handlers
 async def cmd_start(message: types.Message):
-    with SessionLocal() as db:
-        if db.query(Blacklist).filter_by(user_id=message.from_user.id).first():
-            return
-    await message.answer('Добро пожаловать! Выберите опцию:', reply_markup=build_main_menu())
+    if message.from_user.id in BLACKLIST:
+        return
+    await message.answer('Добро пожаловать! Выберите опцию:', reply_markup=_MAIN_MENU)
 
 async def evt_handler(callback: types.CallbackQuery):
     key = 'career' if callback.data == 'evt_career' else 'practice'
-    with SessionLocal() as db:
-        tog = db.query(Toggle).filter_by(name=key).first()
-        if not tog or not tog.enabled:
-            await callback.answer('Временно недоступно', show_alert=True)
-            return
+    if not TOGGLES.get(key, False):
+        await callback.answer('Временно недоступно', show_alert=True)
+        return
     description = f"Описание для {'Центр Карьеры' if key == 'career' else 'Практика'}"
     text, markup = await build_event_menu(key, description)
     await callback.message.edit_text(text, reply_markup=markup)
 
 async def list_vacancies(callback: types.CallbackQuery):
-    text, markup = await build_vacancy_list(page=0)
+    text, markup = await build_vacancy_list(after_id=0)
     await callback.message.edit_text(text, reply_markup=markup)
 
-async def vac_page_handler(callback: types.CallbackQuery):
-    page = int(callback.data.split('_')[-1])
-    text, markup = await build_vacancy_list(page=page)
+async def vac_page_handler(callback: types.CallbackQuery, callback_data: VacPageCB):
+    after_id = callback_data.after_id
+    text, markup = await build_vacancy_list(after_id=after_id)
     await callback.message.edit_text(text, reply_markup=markup)
 
-async def vac_detail(callback: types.CallbackQuery):
-    vid = int(callback.data.split('_')[1])
-    with SessionLocal() as db:
-        vac = db.get(Vacancy, vid)
+async def vac_detail(callback: types.CallbackQuery, callback_data: VacCB):
+    vid = callback_data.id
+    vac = _vac_detail_cache.get(vid)
+    if vac is None:
+        async with AsyncSessionLocal() as db:
+            vac = await db.get(Vacancy, vid)
+        _vac_detail_cache[vid] = vac
     text, markup = await build_vacancy_detail(vac)
     await callback.message.edit_text(text, reply_markup=markup)
 
-async def respond_handler(callback: types.CallbackQuery):
+async def respond_handler(callback: types.CallbackQuery, callback_data: RespCB):
     # Acknowledge the callback to allow UI update
     await callback.answer()
-    parts = callback.data.split('_')
-    mode, key = parts[1], parts[2]
-    with SessionLocal() as db:
-        if db.query(Blacklist).filter_by(user_id=callback.from_user.id).first():
-            return
-        title = key if mode == 'evt' else db.get(Vacancy, int(key)).title
+    mode, key = callback_data.mode, callback_data.key
+    if callback.from_user.id in BLACKLIST:
+        return
+    if mode == 'evt':
+        title = key
+    elif (vac := _vac_detail_cache.get(int(key))) is not None:
+        title = vac.title
+    else:
+        async with AsyncSessionLocal() as db:
+            title = await db.scalar(select(Vacancy.title).where(Vacancy.id == int(key)))
 
     user = callback.from_user
     notif = (
@@ -192,17 +413,16 @@ async def respond_handler(callback: types.CallbackQuery):
         f"Вакансия: {title}\n"
         f"Имя: {user.full_name}"
     )
-    # Send notifications
-    await bot.send_message(ADMIN_ID, notif)
-    send_sms(os.getenv('ADMIN_PHONE'), notif)
-    send_email(os.getenv('ADMIN_EMAIL'), 'Новый отклик', notif)
-
-    builder = InlineKeyboardBuilder()
-    builder.row(types.InlineKeyboardButton(text='Главное меню', callback_data='main'))
-    await callback.message.edit_text('Спасибо! Ваш отклик отправлен.', reply_markup=builder.as_markup())
+    # Send notifications; SMS and email go to the workers, the two Telegram calls run together
+    sms_queue.put_nowait((os.getenv('ADMIN_PHONE'), notif))
+    email_queue.put_nowait(build_email(os.getenv('ADMIN_EMAIL'), 'Новый отклик', notif))
+    await asyncio.gather(
+        bot.send_message(ADMIN_ID, notif),
+        callback.message.edit_text('Спасибо! Ваш отклик отправлен.', reply_markup=_MAIN_ONLY_MARKUP),
+    )
 
 async def to_main(callback: types.CallbackQuery):
-    await callback.message.edit_text('Главное меню:', reply_markup=build_main_menu())
+    await callback.message.edit_text('Главное меню:', reply_markup=_MAIN_MENU)
 
 async def noop_handler(callback: types.CallbackQuery):
     await callback.answer(
@@ -210,56 +430,84 @@ async def noop_handler(callback: types.CallbackQuery):
         show_alert=True
     )
 
+# Callback routing: one dict lookup on the payload prefix instead of a filter per handler
+CALLBACK_ROUTES = {
+    'evt_career': evt_handler,
+    'evt_practice': evt_handler,
+    'all_vacancies': list_vacancies,
+    'main': to_main,
+    'noop': noop_handler,
+    VacCB.__prefix__: vac_detail,
+    VacPageCB.__prefix__: vac_page_handler,
+    RespCB.__prefix__: respond_handler,
+}
+CALLBACK_FACTORIES = {cb.__prefix__: cb for cb in (VacCB, VacPageCB, RespCB)}
+
+async def route_callback(callback: types.CallbackQuery):
+    prefix = callback.data.partition(':')[0]
+    handler = CALLBACK_ROUTES.get(prefix)
+    factory = CALLBACK_FACTORIES.get(prefix)
+    try:
+        callback_data = factory.unpack(callback.data) if factory else None
+    except (TypeError, ValueError):
+        handler = None
+    if handler is None:
+        # Buttons from older keyboards or malformed payloads
+        await callback.answer('Меню устарело, откройте /start', show_alert=True)
+    elif factory is None:
+        await handler(callback)
+    else:
+        await handler(callback, callback_data)
+
 # Admin handlers
-async def cmd_addvac(message: types.Message):
+async def cmd_addvac(message: types.Message, command: CommandObject):
     try:
-        _, data = message.text.split(' ', 1)
-        title, desc, city = [x.strip() for x in data.split('|')]
-        with SessionLocal() as db:
+        title, desc, city = [x.strip() for x in command.args.split('|')]
+        async with AsyncSessionLocal() as db:
             db.add(Vacancy(title=title, description=desc, city=city))
-            db.commit()
+            await db.commit()
+        _vac_cache.clear()
         await message.reply('Вакансия добавлена.')
     except:
         await message.reply('Использование: /addvac Название|Описание|Город')
 
-async def cmd_toggle(message: types.Message):
+async def cmd_toggle(message: types.Message, command: CommandObject):
     try:
-        _, name = message.text.split(' ', 1)
-        with SessionLocal() as db:
-            tog = db.get(Toggle, name)
+        name = command.args.strip()
+        async with AsyncSessionLocal() as db:
+            tog = await db.get(Toggle, name)
             if not tog:
                 tog = Toggle(name=name, enabled=False)
                 db.add(tog)
-            tog.enabled = not tog.enabled
-            db.commit()
-        await message.reply(f"{name} = {tog.enabled}")
+            new_val = tog.enabled = not tog.enabled
+            await db.commit()
+        TOGGLES[name] = new_val
+        await message.reply(f"{name} = {new_val}")
     except:
         await message.reply('Использование: /toggle career или practice')
 
-async def cmd_blacklist(message: types.Message):
+async def cmd_blacklist(message: types.Message, command: CommandObject):
     try:
-        _, uid = message.text.split(' ', 1)
-        uid = int(uid)
-        with SessionLocal() as db:
+        uid = int(command.args)
+        async with AsyncSessionLocal() as db:
             db.add(Blacklist(user_id=uid))
-            db.commit()
+            await db.commit()
+        BLACKLIST.add(uid)
         await message.reply(f"Пользователь {uid} в чёрном списке")
     except:
         await message.reply('Использование: /blacklist USER_ID')
 
 # Register handlers
+dp.startup.register(on_startup)
+dp.startup.register(start_workers)
+dp.shutdown.register(stop_workers)
+dp.shutdown.register(on_shutdown)
 dp.message.register(cmd_start, Command("start"))
-dp.callback_query.register(evt_handler, lambda c: c.data in ("evt_career", "evt_practice"))
-dp.callback_query.register(list_vacancies, lambda c: c.data == "all_vacancies")
-dp.callback_query.register(vac_page_handler, lambda c: c.data.startswith("vac_page_"))
-dp.callback_query.register(vac_detail, lambda c: c.data.startswith("vac_") and not c.data.startswith("vac_page_"))
-dp.callback_query.register(respond_handler, lambda c: c.data.startswith("respond_"))
-dp.callback_query.register(to_main, lambda c: c.data == "main")
-dp.callback_query.register(noop_handler, lambda c: c.data == "noop")
-dp.message.register(cmd_addvac, lambda m: m.from_user.id == ADMIN_ID and m.text.startswith("/addvac"))
-dp.message.register(cmd_toggle, lambda m: m.from_user.id == ADMIN_ID and m.text.startswith("/toggle"))
-dp.message.register(cmd_blacklist, lambda m: m.from_user.id == ADMIN_ID and m.text.startswith("/blacklist"))
-
-# Start polling
+dp.callback_query.register(route_callback)
+dp.message.register(cmd_addvac, F.from_user.id == ADMIN_ID, Command("addvac"))
+dp.message.register(cmd_toggle, F.from_user.id == ADMIN_ID, Command("toggle"))
+dp.message.register(cmd_blacklist, F.from_user.id == ADMIN_ID, Command("blacklist"))
+
+# Start polling (run_polling picks up uvloop as the event loop when it is installed)
 if __name__ == '__main__':
     dp.run_polling(bot, skip_updates=True)